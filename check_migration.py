@@ -1,8 +1,20 @@
 import os
 from supabase import create_client, Client
-from typing import Dict, List
+from postgrest.exceptions import APIError
+from typing import Dict, List, Optional, Tuple
 import json
 import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+# Expected columns, reported when a table has no rows to inspect
+_FALLBACK_COLUMNS = MappingProxyType({
+    'legal_documents': ('id', 'title', 'content', 'document_type', 'source_url', 'publication_date', 'created_at', 'updated_at'),
+    'legal_changes': ('id', 'document_id', 'change_type', 'description', 'impact_level', 'detected_at', 'created_at', 'updated_at'),
+    'contracts': ('id', 'contract_name', 'content', 'contract_type', 'risk_level', 'last_reviewed', 'created_at', 'updated_at'),
+    'contract_impacts': ('id', 'contract_id', 'change_id', 'impact_description', 'action_required', 'priority_level', 'created_at', 'updated_at')
+})
 
 def initialize_supabase(url: str, key: str) -> Client:
     """Initialize Supabase client with provided credentials."""
@@ -10,42 +22,59 @@ def initialize_supabase(url: str, key: str) -> Client:
         raise ValueError("Both Supabase URL and key are required")
     return create_client(url, key)
 
-def check_table_exists(supabase: Client, table_name: str) -> bool:
-    """Check if a table exists in the database."""
+def check_table_exists(supabase: Client, table_name: str) -> Tuple[bool, Optional[str]]:
+    """Check if a table exists in the database, returning the error message if it does not."""
     try:
         response = supabase.table(table_name).select("id").limit(1).execute()
-        return True
+        return True, None
     except Exception as e:
-        print(f"Error checking table {table_name}: {str(e)}")
-        return False
+        return False, str(e)
 
-def check_enum_types(supabase: Client) -> Dict[str, str]:
-    """Check if the enum types exist and their values."""
-    enums = {
-        'legal_document_type': 'legal_documents',
-        'change_type': 'legal_changes',
-        'impact_level': 'legal_changes',
-        'contract_type': 'contracts',
-        'priority_level': 'contract_impacts'
-    }
-    
+def is_missing_function(error: APIError) -> bool:
+    """Check if an RPC failed because the function has not been deployed."""
+    # PGRST202 on current PostgREST; older versions pass through Postgres' 42883
+    return error.code in ('PGRST202', '42883')
+
+def probe_enum_columns(supabase: Client, enums: Dict[str, Tuple[str, str]]) -> Dict[str, str]:
+    """Check each enum type by selecting a column that uses it."""
     results = {}
-    for enum_name, table_name in enums.items():
+    for enum_name, (table_name, column_name) in enums.items():
         try:
-            # Try to select the column that uses this enum type
-            column_name = {
-                'legal_document_type': 'document_type',
-                'change_type': 'change_type',
-                'impact_level': 'impact_level',
-                'contract_type': 'contract_type',
-                'priority_level': 'priority_level'
-            }[enum_name]
-            
             response = supabase.table(table_name).select(column_name).limit(1).execute()
             results[enum_name] = "Verified"
         except Exception as e:
             results[enum_name] = f"Error: {str(e)}"
-    
+
+    return results
+
+def check_enum_types(supabase: Client) -> Dict[str, str]:
+    """Check if the enum types exist and their values."""
+    # Enum type -> (table, column) that uses it
+    enums = {
+        'legal_document_type': ('legal_documents', 'document_type'),
+        'change_type': ('legal_changes', 'change_type'),
+        'impact_level': ('legal_changes', 'impact_level'),
+        'contract_type': ('contracts', 'contract_type'),
+        'priority_level': ('contract_impacts', 'priority_level')
+    }
+
+    # Fetch every enum's labels in a single round trip
+    try:
+        response = supabase.rpc('check_enums', {'names': list(enums)}).execute()
+    except APIError as e:
+        if not is_missing_function(e):
+            return {enum_name: f"Error: {str(e)}" for enum_name in enums}
+        # check_enums() not deployed: probe the columns instead
+        return probe_enum_columns(supabase, enums)
+
+    labels = {row['enum_name']: row['labels'] for row in response.data}
+    results = {}
+    for enum_name in enums:
+        if enum_name in labels:
+            results[enum_name] = f"Verified ({', '.join(labels[enum_name])})"
+        else:
+            results[enum_name] = "Error: type not found"
+
     return results
 
 def check_table_structure(supabase: Client, table_name: str) -> Dict:
@@ -59,12 +88,7 @@ def check_table_structure(supabase: Client, table_name: str) -> Dict:
             columns = list(response.data[0].keys())
         else:
             # If no data, try to get structure from table definition
-            columns = {
-                'legal_documents': ['id', 'title', 'content', 'document_type', 'source_url', 'publication_date', 'created_at', 'updated_at'],
-                'legal_changes': ['id', 'document_id', 'change_type', 'description', 'impact_level', 'detected_at', 'created_at', 'updated_at'],
-                'contracts': ['id', 'contract_name', 'content', 'contract_type', 'risk_level', 'last_reviewed', 'created_at', 'updated_at'],
-                'contract_impacts': ['id', 'contract_id', 'change_id', 'impact_description', 'action_required', 'priority_level', 'created_at', 'updated_at']
-            }.get(table_name, [])
+            columns = list(_FALLBACK_COLUMNS.get(table_name, ()))
         
         return {
             "status": "success",
@@ -77,11 +101,62 @@ def check_table_structure(supabase: Client, table_name: str) -> Dict:
             "error": str(e)
         }
 
+def count_rows(supabase: Client, table_name: str, exact: bool = False) -> str:
+    """Count the rows of a table, returning the error message on failure.
+
+    The planner's estimate is used unless an exact count is requested, since
+    an exact count scans the whole table.
+    """
+    try:
+        count_method = "exact" if exact else "estimated"
+        count = supabase.table(table_name).select("id", count=count_method).limit(1).execute()
+        return str(count.count)
+    except Exception as e:
+        return f"Error - {str(e)}"
+
+def check_table(supabase: Client, table_name: str, exact_count: bool = False) -> Dict:
+    """Run the existence, structure and row count checks for a table."""
+    exists, error = check_table_exists(supabase, table_name)
+    if not exists:
+        return {"exists": False, "error": error}
+    return {
+        "exists": True,
+        "structure": check_table_structure(supabase, table_name),
+        "row_count": count_rows(supabase, table_name, exact_count)
+    }
+
+def introspect_tables(supabase: Client, table_names: List[str]) -> Dict:
+    """Fetch existence, columns and row estimates for all tables in one round trip."""
+    response = supabase.rpc('introspect_tables', {'names': table_names}).execute()
+    # One row per requested table
+    return {row['table_name']: row for row in response.data}
+
+def summarize_table(supabase: Client, table_name: str, info: Dict, exact_count: bool = False) -> Dict:
+    """Build a table report from its introspect_tables entry."""
+    if not info or not info['table_exists']:
+        return {"exists": False}
+    if exact_count:
+        row_count = count_rows(supabase, table_name, exact=True)
+    elif info['row_estimate'] is None:
+        # Never analyzed (normal right after a migration): ask PostgREST instead
+        row_count = count_rows(supabase, table_name)
+    else:
+        row_count = str(info['row_estimate'])
+    return {
+        "exists": True,
+        "structure": {
+            "status": "success",
+            "columns": info['columns']
+        },
+        "row_count": row_count
+    }
+
 def main():
     # Set up argument parser
     parser = argparse.ArgumentParser(description='Verify Supabase migration')
     parser.add_argument('--url', required=True, help='Supabase project URL')
     parser.add_argument('--key', required=True, help='Supabase anon key')
+    parser.add_argument('--exact-count', action='store_true', help='Count rows exactly instead of using the planner estimate')
     args = parser.parse_args()
 
     # Initialize Supabase client
@@ -99,32 +174,51 @@ def main():
         'contract_impacts'
     ]
     
-    print("=== Migration Verification Report ===\n")
-    
-    # Check enum types
-    print("Checking enum types...")
-    enum_results = check_enum_types(supabase)
-    for enum_name, status in enum_results.items():
-        print(f"- {enum_name}: {status}")
-    print()
-    
-    # Check tables
-    print("Checking tables...")
-    for table in tables:
-        print(f"\nTable: {table}")
-        exists = check_table_exists(supabase, table)
-        print(f"- Exists: {exists}")
-        
-        if exists:
-            structure = check_table_structure(supabase, table)
-            print(f"- Structure: {json.dumps(structure, indent=2)}")
-            
-            # Try to count rows
-            try:
-                count = supabase.table(table).select("id", count="exact").execute()
-                print(f"- Row count: {count.count}")
-            except Exception as e:
-                print(f"- Row count: Error - {str(e)}")
+    out = ["=== Migration Verification Report ===", ""]
+
+    # The checks are I/O bound, so run them concurrently and print in order
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        enum_future = executor.submit(check_enum_types, supabase)
+        introspection_future = executor.submit(introspect_tables, supabase, tables)
+
+        # Check enum types
+        out.append("Checking enum types...")
+        enum_results = enum_future.result()
+        for enum_name, status in enum_results.items():
+            out.append(f"- {enum_name}: {status}")
+        out.append("")
+
+        # Check tables
+        out.append("Checking tables...")
+        try:
+            introspection = introspection_future.result()
+            table_results = executor.map(
+                lambda table: summarize_table(supabase, table, introspection.get(table), args.exact_count),
+                tables
+            )
+        except APIError as e:
+            if not is_missing_function(e):
+                raise
+            # introspect_tables() not deployed: probe each table instead
+            out.append("Introspection unavailable, checking tables individually")
+            table_results = executor.map(
+                lambda table: check_table(supabase, table, args.exact_count),
+                tables
+            )
+
+        for table, result in zip(tables, table_results):
+            out.append("")
+            out.append(f"Table: {table}")
+            if result.get('error'):
+                out.append(f"Error checking table {table}: {result['error']}")
+            out.append(f"- Exists: {result['exists']}")
+
+            if result['exists']:
+                out.append(f"- Structure: {json.dumps(result['structure'], indent=2)}")
+                out.append(f"- Row count: {result['row_count']}")
+
+    # Emit the whole report in a single write
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,23 @@
+-- orphan_chunks view used by check_embeddings.py
+-- document_chunks is not created by these migrations, so only define the
+-- view on databases where it exists.
+DO $$
+BEGIN
+  IF to_regclass('public.document_chunks') IS NOT NULL
+     AND to_regclass('public.documents') IS NOT NULL THEN
+    EXECUTE $view$
+      CREATE OR REPLACE VIEW orphan_chunks
+      WITH (security_invoker = true)
+      AS
+        -- Anti-join: chunks whose document no longer exists
+        SELECT dc.id, dc.document_id
+        FROM document_chunks dc
+        LEFT JOIN documents d ON d.id = dc.document_id
+        WHERE d.id IS NULL
+    $view$;
+
+    -- Grant select permissions
+    EXECUTE 'GRANT SELECT ON orphan_chunks TO anon, authenticated';
+  END IF;
+END
+$$;
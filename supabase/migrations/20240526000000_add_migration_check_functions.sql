@@ -0,0 +1,17 @@
+-- Server-side helpers for check_migration.py
+CREATE OR REPLACE FUNCTION check_enums(names TEXT[])
+RETURNS TABLE (enum_name TEXT, labels TEXT[])
+LANGUAGE sql
+STABLE
+AS $$
+  -- One row per existing enum type with its labels in declaration order
+  SELECT t.typname::TEXT, array_agg(e.enumlabel::TEXT ORDER BY e.enumsortorder)
+  FROM pg_type t
+  JOIN pg_enum e ON e.enumtypid = t.oid
+  WHERE t.typname = ANY(names)
+    AND t.typnamespace = 'public'::regnamespace
+  GROUP BY t.typname;
+$$;
+
+-- Grant execute permissions
+GRANT EXECUTE ON FUNCTION check_enums(TEXT[]) TO anon, authenticated;
@@ -0,0 +1,26 @@
+-- Table introspection for check_migration.py
+CREATE OR REPLACE FUNCTION introspect_tables(names TEXT[])
+RETURNS TABLE (table_name TEXT, table_exists BOOLEAN, columns TEXT[], row_estimate BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+  -- Existence, column names and planner row estimate for each requested table
+  SELECT
+    n.name,
+    c.oid IS NOT NULL,
+    COALESCE((
+      SELECT array_agg(col.column_name::TEXT ORDER BY col.ordinal_position)
+      FROM information_schema.columns col
+      WHERE col.table_schema = 'public' AND col.table_name = n.name
+    ), '{}'::TEXT[]),
+    -- reltuples is -1 until the table has been analyzed
+    CASE WHEN c.reltuples < 0 THEN NULL ELSE c.reltuples::BIGINT END
+  FROM unnest(names) AS n(name)
+  LEFT JOIN pg_class c
+    ON c.relname = n.name
+   AND c.relnamespace = 'public'::regnamespace
+   AND c.relkind IN ('r', 'p');
+$$;
+
+-- Grant execute permissions
+GRANT EXECUTE ON FUNCTION introspect_tables(TEXT[]) TO anon, authenticated;